@@ -4,59 +4,38 @@ Creates a PDF displaying all ESRI fonts with complete character grids
 showing symbols and their Unicode/ASCII mappings
 """
 
+import hashlib
+import importlib.util
 import sys
 import subprocess
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from io import BytesIO
 
 # Configuration
 output_pdf = r"C:\Temp\ESRI_Font_Character_Catalog.pdf"
 
-print("=" * 70)
-print("ESRI Font Character Catalog Generator")
-print("=" * 70)
-print(f"Python: {sys.version}")
-print(f"Environment: {sys.executable}\n")
-
-# Check and install required packages
+# Packages installed automatically on first run (import name: pip name)
 required_packages = {
     'reportlab': 'reportlab',
+    'pypdf': 'pypdf',
 }
 
-def check_and_install_package(package_name, pip_name):
-    """Check if package is installed, install if not"""
+# Only start pip when something is actually missing
+missing_packages = [pip_name for package_name, pip_name in required_packages.items()
+                    if importlib.util.find_spec(package_name) is None]
+if missing_packages:
+    print(f"Installing missing packages: {' '.join(missing_packages)}...")
     try:
-        __import__(package_name)
-        print(f"✓ {package_name} is already installed")
-        return True
-    except ImportError:
-        print(f"✗ {package_name} is not installed")
-        print(f"  Installing {pip_name}...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", pip_name])
-            print(f"✓ Successfully installed {pip_name}")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Failed to install {pip_name}: {e}")
-            return False
-
-print("Checking dependencies...")
-print("-" * 70)
-
-all_installed = True
-for package_name, pip_name in required_packages.items():
-    if not check_and_install_package(package_name, pip_name):
-        all_installed = False
-
-if not all_installed:
-    print("\n" + "=" * 70)
-    print("ERROR: Could not install all required packages")
-    print("Please install manually using: pip install reportlab")
-    print("=" * 70)
-    sys.exit(1)
-
-print("-" * 70)
-print("All dependencies satisfied!\n")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *missing_packages])
+    except subprocess.CalledProcessError as e:
+        print("\n" + "=" * 70)
+        print(f"ERROR: Could not install all required packages: {e}")
+        print("Please install manually using: pip install reportlab pypdf")
+        print("=" * 70)
+        sys.exit(1)
+    importlib.invalidate_caches()
 
 # Now import the packages
 from reportlab.lib.pagesizes import letter, landscape
@@ -64,59 +43,14 @@ from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from pypdf import PdfReader, PdfWriter
 
-# Create output directory if it doesn't exist
-output_dir = os.path.dirname(output_pdf)
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
-
-print("=" * 70)
-print("SCANNING FOR ESRI FONTS")
-print("=" * 70)
-
-# Get ESRI fonts only
-font_dict = {}
-
-# Scan ArcGIS Pro font directories
-arcgis_font_dirs = [
-    r"C:\Program Files\ArcGIS\Pro\Resources\Fonts",
-    r"C:\Program Files (x86)\ArcGIS\Desktop10.8\Fonts",  # Desktop fallback
-    os.path.join(os.environ.get('PROGRAMFILES', 'C:\\Program Files'), 'ArcGIS', 'Pro', 'Resources', 'Fonts'),
-]
-
-fonts_found = False
-for font_dir in arcgis_font_dirs:
-    if os.path.exists(font_dir):
-        print(f"Found directory: {font_dir}")
-        fonts_found = True
-        for root, dirs, files in os.walk(font_dir):
-            for file in files:
-                if file.lower().endswith(('.ttf', '.otf')):
-                    font_path = os.path.join(root, file)
-                    font_name = os.path.splitext(file)[0]
-                    if font_name not in font_dict:
-                        font_dict[font_name] = font_path
-                        print(f"  Added: {font_name}")
-
-if not fonts_found:
-    print("\nWARNING: No ArcGIS font directories found!")
-    print("Please update the arcgis_font_dirs list with your ArcGIS installation path.")
-
-fonts = sorted(font_dict.keys())
-total_fonts = len(fonts)
-print(f"\nTotal ESRI fonts found: {total_fonts}\n")
-
-if total_fonts == 0:
-    print("ERROR: No fonts found. Exiting.")
-    sys.exit(1)
-
-print("=" * 70)
-print("GENERATING CHARACTER CATALOG")
-print("=" * 70)
+# Catalog generation time shown on every page. Worker processes re-import
+# this file, so they receive the main process's value via init_worker.
+GENERATION_TIMESTAMP = datetime.now().strftime('%Y-%m-%d %H:%M')
 
 # PDF Setup - using landscape for more space
 page_width, page_height = landscape(letter)
-c = canvas.Canvas(output_pdf, pagesize=landscape(letter))
 
 margin = 0.3 * inch
 cell_size = 0.50 * inch
@@ -125,195 +59,421 @@ font_size_label = 6
 cols = 16  # 16 columns for character grid
 rows = 14  # 14 rows for character grid (fits better on page)
 
-def draw_page_header(canvas_obj, font_name, page_num, total_pages):
-    """Draw page header with font name"""
+# Special character names for non-printable/special keys
+special_chars = {
+    32: "Space", 33: "!", 34: '"', 35: "#", 36: "$", 37: "%", 38: "&", 39: "'",
+    40: "(", 41: ")", 42: "*", 43: "+", 44: ",", 45: "-", 46: ".", 47: "/",
+    58: ":", 59: ";", 60: "<", 61: "=", 62: ">", 63: "?", 64: "@",
+    91: "[", 92: "\\", 93: "]", 94: "^", 95: "_", 96: "`",
+    123: "{", 124: "|", 125: "}", 126: "~", 127: "DEL"
+}
+
+# Every character the catalog can show, indexed by code
+CHARS = tuple(map(chr, range(512)))
+
+def key_label_for(code):
+    """Keyboard key label shown at the top of an ASCII cell"""
+    if code in special_chars:
+        key_label = special_chars[code]
+    elif 48 <= code <= 57:  # Numbers 0-9
+        key_label = CHARS[code]
+    elif 65 <= code <= 90:  # Uppercase A-Z
+        key_label = CHARS[code]
+    elif 97 <= code <= 122:  # Lowercase a-z
+        key_label = CHARS[code]
+    else:
+        key_label = CHARS[code] if code < 127 else f"U+{code:04X}"
+    
+    # Truncate long key names
+    if len(key_label) > 6:
+        key_label = key_label[:5] + "."
+    return key_label
+
+# Cell text is the same for every font, so build it once:
+# (key label, decimal, hex, character) for the ASCII page starting at 32
+ASCII_CELLS = [(key_label_for(code), f"{code}", f"x{code:02X}", CHARS[code])
+               for code in range(32, 32 + rows * cols)]
+# (Unicode label, decimal, character) for the extended page starting at 256
+EXT_CELLS = [(f"U+{code:04X}", f"{code}", CHARS[code])
+             for code in range(256, 256 + rows * cols)]
+
+# Extended pages covering less than this share of the grid only show the
+# codes the font actually maps
+EXT_SPARSE_COVERAGE = 0.05
+
+# Drawing anchors for every grid cell, row by row. The layout is fixed, so
+# all per-cell coordinate math happens once here.
+_cell_corners = [(margin + (col * cell_size), page_height - 0.9 * inch - (row * cell_size))
+                 for row in range(rows) for col in range(cols)]
+CELL_BORDERS = [(x, y - cell_size) for x, y in _cell_corners]
+LABEL_ORIGINS = [(x + 0.03 * inch, y - 0.12 * inch) for x, y in _cell_corners]
+DEC_ORIGINS = [(x + 0.03 * inch, y - 0.20 * inch) for x, y in _cell_corners]
+HEX_ORIGINS = [(x + 0.03 * inch, y - 0.27 * inch) for x, y in _cell_corners]
+# Centre x and baseline of the large glyph
+GLYPH_ANCHORS = [(x + cell_size/2, y - cell_size + 0.15 * inch) for x, y in _cell_corners]
+
+def draw_page_header(canvas_obj, font_name):
+    """Draw page header with font name (page numbers are stamped after merging)"""
     canvas_obj.setFont("Helvetica-Bold", 14)
     canvas_obj.drawString(margin, page_height - 0.3 * inch, f"Font: {font_name}")
     
     canvas_obj.setFont("Helvetica", 8)
-    canvas_obj.drawString(page_width - 2 * inch, page_height - 0.3 * inch, 
-                         f"Page {page_num} of {total_pages}")
-    
     canvas_obj.drawString(margin, page_height - 0.5 * inch,
-                         f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+                         f"Generated: {GENERATION_TIMESTAMP}")
     
     # Draw line separator
     canvas_obj.line(margin, page_height - 0.6 * inch, 
                    page_width - margin, page_height - 0.6 * inch)
 
-def draw_character_grid(canvas_obj, font_id, font_name, start_code=32, end_code=255):
-    """Draw a grid of characters with their codes"""
+def draw_character_grid(canvas_obj, font_id, font_name, supported, start_code=32, end_code=255):
+    """Draw a grid of characters with their codes, using a dash for codes not in supported"""
+    char_count = 0
+    cells = list(zip(range(start_code, end_code + 1), ASCII_CELLS[start_code - 32:end_code - 31]))
     
-    y_start = page_height - 0.9 * inch
-    x_start = margin
+    # Pass 1: cell borders, stroked as a single path
+    borders = canvas_obj.beginPath()
+    add_rect = borders.rect
+    for (x, y), _ in zip(CELL_BORDERS, cells):
+        add_rect(x, y, cell_size, cell_size)
+    canvas_obj.setStrokeColorRGB(0.8, 0.8, 0.8)
+    canvas_obj.drawPath(borders, stroke=1, fill=0)
     
-    char_count = 0
+    # All text goes into one text object, switching font/colour per pass
+    text = canvas_obj.beginText()
+    # Bound once, these run for every cell
+    set_origin = text.setTextOrigin
+    text_out = text.textOut
     
-    # Special character names for non-printable/special keys
-    special_chars = {
-        32: "Space", 33: "!", 34: '"', 35: "#", 36: "$", 37: "%", 38: "&", 39: "'",
-        40: "(", 41: ")", 42: "*", 43: "+", 44: ",", 45: "-", 46: ".", 47: "/",
-        58: ":", 59: ";", 60: "<", 61: "=", 62: ">", 63: "?", 64: "@",
-        91: "[", 92: "\\", 93: "]", 94: "^", 95: "_", 96: "`",
-        123: "{", 124: "|", 125: "}", 126: "~", 127: "DEL"
-    }
-    
-    for code in range(start_code, min(end_code + 1, start_code + (rows * cols))):
-        row = (code - start_code) // cols
-        col = (code - start_code) % cols
-        
-        if row >= rows:
-            break
-        
-        x = x_start + (col * cell_size)
-        y = y_start - (row * cell_size)
-        
-        # Draw cell border
-        canvas_obj.setStrokeColorRGB(0.8, 0.8, 0.8)
-        canvas_obj.rect(x, y - cell_size, cell_size, cell_size)
-        
-        # Keyboard key label (top)
-        if code in special_chars:
-            key_label = special_chars[code]
-        elif 48 <= code <= 57:  # Numbers 0-9
-            key_label = chr(code)
-        elif 65 <= code <= 90:  # Uppercase A-Z
-            key_label = chr(code)
-        elif 97 <= code <= 122:  # Lowercase a-z
-            key_label = chr(code)
-        else:
-            key_label = chr(code) if code < 127 else f"U+{code:04X}"
-        
-        canvas_obj.setFont("Helvetica-Bold", font_size_label)
-        canvas_obj.setFillColorRGB(0.2, 0.2, 0.2)
-        # Truncate long key names
-        if len(key_label) > 6:
-            key_label = key_label[:5] + "."
-        canvas_obj.drawString(x + 0.03 * inch, y - 0.12 * inch, key_label)
-        
-        # Decimal and Hex codes
-        canvas_obj.setFont("Helvetica", 6)
-        canvas_obj.setFillColorRGB(0.5, 0.5, 0.5)
-        canvas_obj.drawString(x + 0.03 * inch, y - 0.20 * inch, f"{code}")
-        canvas_obj.drawString(x + 0.03 * inch, y - 0.27 * inch, f"x{code:02X}")
-        
-        # Draw the character from the ESRI font (centered)
-        try:
-            canvas_obj.setFont(font_id, font_size_char)
-            canvas_obj.setFillColorRGB(0, 0, 0)
-            char = chr(code)
-            canvas_obj.drawCentredString(x + cell_size/2, y - cell_size + 0.15 * inch, char)
+    # Pass 2: keyboard key labels (top)
+    text.setFont("Helvetica-Bold", font_size_label)
+    text.setFillColorRGB(0.2, 0.2, 0.2)
+    for (x, y), (code, (key_label, dec, hex_, char)) in zip(LABEL_ORIGINS, cells):
+        set_origin(x, y)
+        text_out(key_label)
+    
+    # Decimal and Hex codes
+    text.setFont("Helvetica", 6)
+    text.setFillColorRGB(0.5, 0.5, 0.5)
+    for (x, y), (code, (key_label, dec, hex_, char)) in zip(DEC_ORIGINS, cells):
+        set_origin(x, y)
+        text_out(dec)
+    for (x, y), (code, (key_label, dec, hex_, char)) in zip(HEX_ORIGINS, cells):
+        set_origin(x, y)
+        text_out(hex_)
+    
+    # Pass 3: the characters from the ESRI font (centered)
+    missing = []
+    add_missing = missing.append
+    glyph_width = pdfmetrics.getFont(font_id).stringWidth
+    text.setFont(font_id, font_size_char)
+    text.setFillColorRGB(0, 0, 0)
+    for (x, y), (code, (key_label, dec, hex_, char)) in zip(GLYPH_ANCHORS, cells):
+        if code in supported:
+            set_origin(x - glyph_width(char, font_size_char) / 2, y)
+            text_out(char)
             char_count += 1
-        except:
-            # If character can't be rendered
-            canvas_obj.setFont("Helvetica", 8)
-            canvas_obj.setFillColorRGB(0.8, 0.8, 0.8)
-            canvas_obj.drawCentredString(x + cell_size/2, y - cell_size + 0.15 * inch, "—")
-        
-        canvas_obj.setFillColorRGB(0, 0, 0)
+        else:
+            # Character is not mapped by the font
+            add_missing((x, y))
+    
+    if missing:
+        dash_offset = pdfmetrics.stringWidth("—", "Helvetica", 8) / 2
+        text.setFont("Helvetica", 8)
+        text.setFillColorRGB(0.8, 0.8, 0.8)
+        for x, y in missing:
+            set_origin(x - dash_offset, y)
+            text_out("—")
+    
+    canvas_obj.drawText(text)
+    canvas_obj.setFillColorRGB(0, 0, 0)
     
     return char_count
 
-def draw_extended_grid(canvas_obj, font_id, font_name, start_code=256, end_code=512):
-    """Draw extended Unicode characters if they exist"""
-    y_start = page_height - 0.9 * inch
-    x_start = margin
-    
+def draw_extended_grid(canvas_obj, font_id, font_name, supported, codes=range(256, 512)):
+    """Draw extended Unicode characters, filling the grid with codes in order"""
     char_count = 0
-    for code in range(start_code, min(end_code + 1, start_code + (rows * cols))):
-        row = (code - start_code) // cols
-        col = (code - start_code) % cols
-        
-        if row >= rows:
-            break
-        
-        x = x_start + (col * cell_size)
-        y = y_start - (row * cell_size)
-        
-        canvas_obj.setStrokeColorRGB(0.8, 0.8, 0.8)
-        canvas_obj.rect(x, y - cell_size, cell_size, cell_size)
-        
-        # Unicode label
-        canvas_obj.setFont("Helvetica-Bold", font_size_label)
-        canvas_obj.setFillColorRGB(0.2, 0.2, 0.2)
-        canvas_obj.drawString(x + 0.03 * inch, y - 0.12 * inch, f"U+{code:04X}")
-        
-        # Decimal code
-        canvas_obj.setFont("Helvetica", 6)
-        canvas_obj.setFillColorRGB(0.5, 0.5, 0.5)
-        canvas_obj.drawString(x + 0.03 * inch, y - 0.20 * inch, f"{code}")
-        
-        try:
-            canvas_obj.setFont(font_id, font_size_char)
-            canvas_obj.setFillColorRGB(0, 0, 0)
-            char = chr(code)
-            canvas_obj.drawCentredString(x + cell_size/2, y - cell_size + 0.15 * inch, char)
+    cells = [(code, EXT_CELLS[code - 256]) for code in codes[:len(EXT_CELLS)]]
+    
+    borders = canvas_obj.beginPath()
+    add_rect = borders.rect
+    for (x, y), _ in zip(CELL_BORDERS, cells):
+        add_rect(x, y, cell_size, cell_size)
+    canvas_obj.setStrokeColorRGB(0.8, 0.8, 0.8)
+    canvas_obj.drawPath(borders, stroke=1, fill=0)
+    
+    text = canvas_obj.beginText()
+    # Bound once, these run for every cell
+    set_origin = text.setTextOrigin
+    text_out = text.textOut
+    
+    # Unicode label
+    text.setFont("Helvetica-Bold", font_size_label)
+    text.setFillColorRGB(0.2, 0.2, 0.2)
+    for (x, y), (code, (unicode_label, dec, char)) in zip(LABEL_ORIGINS, cells):
+        set_origin(x, y)
+        text_out(unicode_label)
+    
+    # Decimal code
+    text.setFont("Helvetica", 6)
+    text.setFillColorRGB(0.5, 0.5, 0.5)
+    for (x, y), (code, (unicode_label, dec, char)) in zip(DEC_ORIGINS, cells):
+        set_origin(x, y)
+        text_out(dec)
+    
+    missing = []
+    add_missing = missing.append
+    glyph_width = pdfmetrics.getFont(font_id).stringWidth
+    text.setFont(font_id, font_size_char)
+    text.setFillColorRGB(0, 0, 0)
+    for (x, y), (code, (unicode_label, dec, char)) in zip(GLYPH_ANCHORS, cells):
+        if code in supported:
+            set_origin(x - glyph_width(char, font_size_char) / 2, y)
+            text_out(char)
             char_count += 1
-        except:
-            canvas_obj.setFont("Helvetica", 8)
-            canvas_obj.setFillColorRGB(0.8, 0.8, 0.8)
-            canvas_obj.drawCentredString(x + cell_size/2, y - cell_size + 0.15 * inch, "—")
-        
-        canvas_obj.setFillColorRGB(0, 0, 0)
+        else:
+            add_missing((x, y))
+    
+    if missing:
+        dash_offset = pdfmetrics.stringWidth("—", "Helvetica", 8) / 2
+        text.setFont("Helvetica", 8)
+        text.setFillColorRGB(0.8, 0.8, 0.8)
+        for x, y in missing:
+            set_origin(x - dash_offset, y)
+            text_out("—")
+    
+    canvas_obj.drawText(text)
+    canvas_obj.setFillColorRGB(0, 0, 0)
     
     return char_count
 
-# Process each font
-page_count = 0
-for font_idx, font_name in enumerate(fonts):
-    font_path = font_dict[font_name]
+def init_worker(generation_timestamp):
+    """Use the main process's generation timestamp in a worker process"""
+    global GENERATION_TIMESTAMP
+    GENERATION_TIMESTAMP = generation_timestamp
+
+def render_font(font_name, font_path):
+    """Render the catalog pages for one font and return them as PDF bytes.
     
-    try:
-        # Register the font
-        font_id = font_name.replace(" ", "_").replace("-", "_").replace(".", "_")
-        
-        if font_id not in pdfmetrics.getRegisteredFontNames():
-            pdfmetrics.registerFont(TTFont(font_id, font_path))
-        
-        print(f"Processing {font_idx + 1}/{total_fonts}: {font_name}")
-        
-        # Page 1: ASCII range (32-255)
-        page_count += 1
-        if page_count > 1:
-            c.showPage()
-        
-        draw_page_header(c, font_name, page_count, total_fonts * 2)
+    Runs in a worker process, so each worker only registers the fonts it draws.
+    """
+    # Register the font
+    font_id = font_name.replace(" ", "_").replace("-", "_").replace(".", "_")
+    
+    font = TTFont(font_id, font_path)
+    pdfmetrics.registerFont(font)
+    
+    # Catalog codes the font's cmap maps to a real glyph (glyph 0 is .notdef).
+    # reportlab subsets on the fly, so only these glyphs end up embedded.
+    char_to_glyph = font.face.charToGlyph
+    supported = {code for code in range(32, 512) if char_to_glyph.get(code)}
+    
+    ascii_supported = any(code in supported for code in range(32, 32 + len(ASCII_CELLS)))
+    ext_supported = [code for code in range(256, 256 + len(EXT_CELLS)) if code in supported]
+    
+    pdf_buffer = BytesIO()
+    c = canvas.Canvas(pdf_buffer, pagesize=landscape(letter), pageCompression=1)
+    
+    # Page 1: ASCII range (32-255), skipped for fonts that only map extended
+    # codes. A font mapping neither range keeps it so it still appears.
+    if ascii_supported or not ext_supported:
+        draw_page_header(c, font_name)
         
         # Add legend
         c.setFont("Helvetica", 9)
         c.drawString(margin, page_height - 0.75 * inch, 
                     "Each cell shows: Key name (top), Decimal code, Hex code, Symbol (center)")
         
-        draw_character_grid(c, font_id, font_name, 32, 255)
-        
-        # Page 2: Extended Unicode range (256-511)
-        page_count += 1
+        draw_character_grid(c, font_id, font_name, supported, 32, 255)
         c.showPage()
-        
-        draw_page_header(c, font_name, page_count, total_fonts * 2)
+    
+    # Page 2: Extended Unicode range (256-511), skipped when the font maps
+    # none of it and compacted to the mapped codes when it maps very few
+    if ext_supported:
+        draw_page_header(c, font_name)
         
         c.setFont("Helvetica", 9)
-        c.drawString(margin, page_height - 0.75 * inch,
-                    "Extended Unicode (256-511) - Each cell shows: Unicode ID (top), Decimal code, Symbol (center)")
-        
-        draw_extended_grid(c, font_id, font_name, 256, 511)
+        if len(ext_supported) < EXT_SPARSE_COVERAGE * len(EXT_CELLS):
+            c.drawString(margin, page_height - 0.75 * inch,
+                        f"Extended Unicode (256-511) - Only the {len(ext_supported)} codes in this font - "
+                        "Each cell shows: Unicode ID (top), Decimal code, Symbol (center)")
+            draw_extended_grid(c, font_id, font_name, supported, ext_supported)
+        else:
+            c.drawString(margin, page_height - 0.75 * inch,
+                        "Extended Unicode (256-511) - Each cell shows: Unicode ID (top), Decimal code, Symbol (center)")
+            draw_extended_grid(c, font_id, font_name, supported)
+        c.showPage()
+    
+    c.save()
+    return pdf_buffer.getvalue()
+
+def stamp_page_numbers(writer):
+    """Overlay "Page N of M" on every page of the merged catalog"""
+    total_pages = len(writer.pages)
+    
+    overlay_buffer = BytesIO()
+    overlay = canvas.Canvas(overlay_buffer, pagesize=landscape(letter), pageCompression=1)
+    for page_num in range(1, total_pages + 1):
+        overlay.setFont("Helvetica", 8)
+        overlay.drawString(page_width - 2 * inch, page_height - 0.3 * inch,
+                           f"Page {page_num} of {total_pages}")
+        overlay.showPage()
+    overlay.save()
+    
+    for page, number_page in zip(writer.pages, PdfReader(overlay_buffer).pages):
+        page.merge_page(number_page)
+        # Merging leaves the combined content stream uncompressed
+        page.compress_content_streams()
+
+def iter_font_files(directory):
+    """Yield the path of every .ttf/.otf file below directory.
+    
+    Like os.walk, a folder's own files come before its subfolders' and
+    folders that can't be read are silently skipped.
+    """
+    font_files = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    # Skip hidden and system folders such as $RECYCLE.BIN
+                    if not entry.name.startswith(('.', '$')):
+                        subdirs.append(entry.path)
+                elif entry.name.lower().endswith(('.ttf', '.otf')) and entry.is_file():
+                    font_files.append(entry.path)
+    except OSError:
+        return
+    
+    yield from font_files
+    for subdir in subdirs:
+        yield from iter_font_files(subdir)
+
+def font_fingerprint(font_path):
+    """File size plus a hash of the first 4 KB (header and table directory)"""
+    with open(font_path, 'rb') as f:
+        head = f.read(4096)
+    return os.path.getsize(font_path), hashlib.sha1(head).hexdigest()
+
+def main():
+    print("=" * 70)
+    print("ESRI Font Character Catalog Generator")
+    print("=" * 70)
+    print(f"Python: {sys.version}")
+    print(f"Environment: {sys.executable}\n")
+
+    # Create output directory if it doesn't exist
+    output_dir = os.path.dirname(output_pdf)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    print("=" * 70)
+    print("SCANNING FOR ESRI FONTS")
+    print("=" * 70)
+
+    # Get ESRI fonts only
+    font_dict = {}
+
+    # Scan ArcGIS Pro font directories
+    arcgis_font_dirs = [
+        r"C:\Program Files\ArcGIS\Pro\Resources\Fonts",
+        r"C:\Program Files (x86)\ArcGIS\Desktop10.8\Fonts",  # Desktop fallback
+        os.path.join(os.environ.get('PROGRAMFILES', 'C:\\Program Files'), 'ArcGIS', 'Pro', 'Resources', 'Fonts'),
+    ]
+
+    # PROGRAMFILES usually resolves to the first entry, so drop duplicates
+    unique_font_dirs = {}
+    for font_dir in arcgis_font_dirs:
+        unique_font_dirs.setdefault(os.path.normcase(os.path.normpath(font_dir)), font_dir)
+
+    seen_fingerprints = set()
+    fonts_found = False
+    for font_dir in unique_font_dirs.values():
+        if os.path.exists(font_dir):
+            fonts_found = True
+            # Large font folders produce hundreds of lines, so write them in one go
+            messages = [f"Found directory: {font_dir}"]
+            for font_path in iter_font_files(font_dir):
+                font_name = os.path.splitext(os.path.basename(font_path))[0]
+                if font_name in font_dict:
+                    continue
+                
+                # The same file under another name would only repeat its pages
+                try:
+                    fingerprint = font_fingerprint(font_path)
+                except OSError as e:
+                    messages.append(f"  ERROR reading {font_name}: {str(e)}")
+                    continue
+                if fingerprint in seen_fingerprints:
+                    messages.append(f"  Skipped duplicate: {font_name}")
+                    continue
+                
+                seen_fingerprints.add(fingerprint)
+                font_dict[font_name] = font_path
+                messages.append(f"  Added: {font_name}")
+            sys.stdout.write("\n".join(messages) + "\n")
+
+    if not fonts_found:
+        print("\nWARNING: No ArcGIS font directories found!")
+        print("Please update the arcgis_font_dirs list with your ArcGIS installation path.")
+
+    fonts = sorted(font_dict.keys())
+    total_fonts = len(fonts)
+    print(f"\nTotal ESRI fonts found: {total_fonts}\n")
+
+    if total_fonts == 0:
+        print("ERROR: No fonts found. Exiting.")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("GENERATING CHARACTER CATALOG")
+    print("=" * 70)
+
+    # Fonts are independent, so render them in parallel and merge the results
+    # in catalog order
+    writer = PdfWriter()
+    fonts_processed = 0
+    with ProcessPoolExecutor(initializer=init_worker, initargs=(GENERATION_TIMESTAMP,)) as executor:
+        futures = [executor.submit(render_font, font_name, font_dict[font_name]) for font_name in fonts]
+    
+        for font_idx, (font_name, future) in enumerate(zip(fonts, futures)):
+            try:
+                pdf_bytes = future.result()
+            except Exception as e:
+                print(f"  ERROR processing {font_name}: {str(e)}")
+                continue
         
-    except Exception as e:
-        print(f"  ERROR processing {font_name}: {str(e)}")
-        continue
-
-# Save PDF
-c.save()
-
-print("\n" + "=" * 70)
-print("SUCCESS!")
-print("=" * 70)
-print(f"Character catalog created: {output_pdf}")
-print(f"Total fonts processed: {total_fonts}")
-print(f"Total pages: {page_count}")
-print("=" * 70)
-print("\nEach font has 2 pages:")
-print("  Page 1: ASCII characters (codes 32-255)")
-print("  Page 2: Extended Unicode (codes 256-511)")
-print("  Format: Character shown with decimal and hex codes")
-print("=" * 70)
+            print(f"Processed {font_idx + 1}/{total_fonts}: {font_name}")
+            writer.append(BytesIO(pdf_bytes))
+            fonts_processed += 1
+
+    if len(writer.pages) == 0:
+        print("\nERROR: No fonts could be rendered. Exiting.")
+        sys.exit(1)
+
+    stamp_page_numbers(writer)
+    # Every per-font PDF carries its own copy of the Helvetica resources
+    # compress_identical_objects needs pypdf 5+. Deliberate fallback: on an
+    # older pypdf the catalog is still written, just without this dedupe.
+    if hasattr(writer, "compress_identical_objects"):
+        writer.compress_identical_objects()
+    page_count = len(writer.pages)
+
+    # Save PDF
+    with open(output_pdf, 'wb', buffering=1 << 20) as f:
+        writer.write(f)
+
+    print("\n" + "=" * 70)
+    print("SUCCESS!")
+    print("=" * 70)
+    print(f"Character catalog created: {output_pdf}")
+    print(f"Total fonts processed: {fonts_processed} of {total_fonts}")
+    print(f"Total pages: {page_count}")
+    print("=" * 70)
+    print("\nEach font has up to 2 pages:")
+    print("  Page 1: ASCII characters (codes 32-255), omitted if the font only has extended ones")
+    print("  Page 2: Extended Unicode (codes 256-511), omitted if the font has none")
+    print("  Format: Character shown with decimal and hex codes")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()